@@ -94,7 +94,7 @@ class ImageNoise(object):
         :return: estimate of the noise per pixel based on the model flux
         """
         if self._noise_map is not None:
-            return self._noise_map ** 2
+            return self.C_D
         else:
             return covariance_matrix(model, self._background_rms, self._exp_map, self._gradient_boost_factor)
 
@@ -102,7 +102,7 @@ class ImageNoise(object):
 @export
 def covariance_matrix(data, background_rms, exposure_map, gradient_boost_factor=None):
     """
-    returns a diagonal matrix for the covariance estimation which describes the error
+    returns the diagonal of the covariance matrix which describes the error
 
     Notes:
 
@@ -118,13 +118,13 @@ def covariance_matrix(data, background_rms, exposure_map, gradient_boost_factor=
     :param exposure_map: exposure time per pixel, e.g. in units of seconds
     :param gradient_boost_factor: None or float, variance terms added in quadrature scaling with
          gradient^2 * gradient_boost_factor
-    :return: len(d) x len(d) matrix that give the error of background and Poisson components; (photons/second)^2
+    :return: array of the same shape as the data with the variance of background and Poisson components per pixel
+     (diagonal of the covariance matrix); (photons/second)^2
     """
     if gradient_boost_factor is not None:
         gradient_map = image_util.gradient_map(data) * gradient_boost_factor
     else:
         gradient_map = 0
-    d_pos = np.zeros_like(data)
-    d_pos[data >= 0] = data[data >= 0]
-    sigma = d_pos / exposure_map + background_rms ** 2 + gradient_map ** 2
+    sigma = np.fmax(data, 0) / exposure_map
+    sigma += background_rms * background_rms + gradient_map * gradient_map
     return sigma
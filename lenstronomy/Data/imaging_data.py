@@ -1,10 +1,16 @@
 import numpy as np
 
 from lenstronomy.Data.pixel_grid import PixelGrid
-from lenstronomy.Data.image_noise import ImageNoise
+from lenstronomy.Data.image_noise import ImageNoise, covariance_matrix
+from lenstronomy.Util import image_util
 
 __all__ = ['ImageData']
 
+# likelihood masks evaluating less than this fraction of the pixels are evaluated on the masked pixels only
+_sparse_mask_fraction = 0.5
+# number of pixels above which the numba likelihood is multi-threaded by default
+_numba_parallel_num_pixel = 10 ** 6
+
 
 class ImageData(PixelGrid, ImageNoise):
     """
@@ -28,6 +34,11 @@ class ImageData(PixelGrid, ImageNoise):
     - 'noise_map': Gaussian noise (1-sigma) for each individual pixel.
     If this keyword is set, the other noise properties will be ignored.
 
+    optional keywords for the likelihood computation:
+    - 'numba_likelihood': bool, if True, evaluates the likelihood and reduced residuals with numba compiled kernels
+    - 'numba_parallel': None or bool, multi-threaded numba likelihood (None: only for images with more than 10^6 pixels)
+    - 'precision': None or 'float32', if 'float32', the data and noise arrays are stored in single precision
+
 
     Notes:
     ------
@@ -38,7 +49,8 @@ class ImageData(PixelGrid, ImageNoise):
 
     """
     def __init__(self, image_data, exposure_time=None, background_rms=None, noise_map=None, gradient_boost_factor=None,
-                 ra_at_xy_0=0, dec_at_xy_0=0, transform_pix2angle=None, ra_shift=0, dec_shift=0):
+                 ra_at_xy_0=0, dec_at_xy_0=0, transform_pix2angle=None, ra_shift=0, dec_shift=0,
+                 numba_likelihood=False, numba_parallel=None, precision=None):
         """
 
         :param image_data: 2d numpy array of the image data
@@ -53,13 +65,45 @@ class ImageData(PixelGrid, ImageNoise):
         :param dec_at_xy_0: dec coordinate at pixel (0,0)
         :param ra_shift: RA shift of pixel grid
         :param dec_shift: DEC shift of pixel grid
+        :param numba_likelihood: bool, if True, evaluates the likelihood and reduced residuals with numba compiled
+         kernels in a single pass over the pixels (requires numba)
+        :param numba_parallel: None or bool; if True, the numba likelihood distributes the pixels over the numba
+         threads. If None, the parallel version is used for images with more than 10^6 pixels.
+        :param precision: None or 'float32'; if 'float32', the data and noise arrays used in the likelihood are stored
+         as contiguous single precision arrays and the chi2 terms are computed and summed (with pairwise summation)
+         in single precision.
         """
+        if precision not in [None, 'float32']:
+            raise ValueError("precision %s not supported. Chose among None and 'float32'." % precision)
+        self._dtype = np.float32 if precision == 'float32' else None
+        image_data = self._cast(image_data)
         nx, ny = np.shape(image_data)
         if transform_pix2angle is None:
             transform_pix2angle = np.array([[1, 0], [0, 1]])
         PixelGrid.__init__(self, nx, ny, transform_pix2angle, ra_at_xy_0 + ra_shift, dec_at_xy_0 + dec_shift)
         ImageNoise.__init__(self, image_data, exposure_time=exposure_time, background_rms=background_rms,
                             noise_map=noise_map, gradient_boost_factor=gradient_boost_factor, verbose=False)
+        self._numba_likelihood = numba_likelihood
+        if numba_parallel is None:
+            numba_parallel = nx * ny > _numba_parallel_num_pixel
+        self._numba_parallel = numba_parallel
+        self._likelihood_mask = None
+        self._mask_index = None
+        if noise_map is not None:
+            # the covariance does not depend on the model and its inverse can be used in all likelihood evaluations
+            self._inv_C_D = self._cast(1. / self.C_D)
+            self._inv_sqrt_C_D = np.sqrt(self._inv_C_D)
+
+    def _cast(self, array):
+        """
+        casts an array to the precision of the likelihood evaluation
+
+        :param array: numpy array
+        :return: array in the chosen precision (unchanged if precision=None)
+        """
+        if self._dtype is None:
+            return array
+        return np.ascontiguousarray(array, dtype=self._dtype)
 
     def update_data(self, image_data):
         """
@@ -72,9 +116,42 @@ class ImageData(PixelGrid, ImageNoise):
         nx, ny = np.shape(image_data)
         if not self._nx == nx and not self._ny == ny:
             raise ValueError("shape of new data %s %s must equal old data %s %s!" % (nx, ny, self._nx, self._ny))
-        self._data = image_data
+        self._data = self._cast(image_data)
         if hasattr(self, '_C_D') and self._noise_map is None:
             del self._C_D
+        if self._likelihood_mask is not None:
+            self.set_likelihood_mask(self._likelihood_mask)
+
+    def set_likelihood_mask(self, mask):
+        """
+        sets the mask used in repeated likelihood evaluations. When log_likelihood() is called with this mask, the
+        masked inverse noise map is re-used and, if only a minor fraction of the pixels is evaluated, the likelihood
+        is computed on the evaluated pixels only with the data and noise terms gathered in advance.
+        The mask must not be modified in place after it has been set.
+
+        :param mask: 2d boolean array, pixels with False are ignored in the likelihood
+        :return: None
+        """
+        self._likelihood_mask = mask
+        self._mask_index = None
+        if self._noise_map is not None:
+            self._likelihood_weights = self._inv_C_D * mask
+        if self._numba_likelihood is True or np.asarray(mask).dtype != bool:
+            return
+        if self._noise_map is None and (self._gradient_boost_factor is not None or self._exp_map is None):
+            # the gradient of the model requires the full image and without exposure map the dense path raises
+            return
+        if np.mean(mask) >= _sparse_mask_fraction:
+            return
+        self._mask_index = np.flatnonzero(mask)
+        self._data_masked = self._data.ravel()[self._mask_index]
+        if self._noise_map is not None:
+            self._C_D_masked = self.C_D.ravel()[self._mask_index]
+            self._inv_C_D_masked = self._inv_C_D.ravel()[self._mask_index]
+        elif np.isscalar(self._exp_map):
+            self._exp_map_masked = self._exp_map
+        else:
+            self._exp_map_masked = np.ravel(self._exp_map)[self._mask_index]
 
     @property
     def data(self):
@@ -97,8 +174,141 @@ class ImageData(PixelGrid, ImageNoise):
             This can e.g. come from model errors in the PSF estimation.
         :return: the natural logarithm of the likelihood p(data|model)
         """
+        if self._numba_likelihood is True:
+            from lenstronomy.Data import numba_likelihood
+            model = self._cast(model)
+            C_D = self._C_D_model_numba(model)
+            error_map = np.broadcast_to(additional_error_map, np.shape(model))
+            mask = np.broadcast_to(mask, np.shape(model))
+            if self._numba_parallel is True:
+                return - numba_likelihood.chi2_parallel(model, self._data, C_D, mask, error_map) / 2
+            return - numba_likelihood.chi2(model, self._data, C_D, mask, error_map) / 2
+        if self._mask_index is not None and mask is self._likelihood_mask:
+            return self._log_likelihood_sparse(model, additional_error_map)
+        if self._noise_map is not None and np.isscalar(additional_error_map) and additional_error_map == 0:
+            if mask is self._likelihood_mask:
+                weights = self._likelihood_weights
+            else:
+                weights = self._inv_C_D * mask
+            return - self._chi2(self._subtract(model), weights) / 2
+        model = self._cast(model)
         C_D = self.C_D_model(model)
-        X2 = (model - self._data) ** 2 / (C_D + np.abs(additional_error_map)) * mask
-        X2 = np.array(X2)
-        logL = - np.sum(X2) / 2
+        weights = self._cast(mask / (C_D + np.abs(additional_error_map)))
+        logL = - self._chi2(model - self._data, weights) / 2
         return logL
+
+    def _subtract(self, model):
+        """
+        model - data in the precision of the likelihood evaluation, without a separate cast of the model
+
+        :param model: model(s) with the data shape in the last two dimensions
+        :return: model - data
+        """
+        return np.subtract(model, self._data, dtype=self._dtype)
+
+    def _chi2(self, diff, weights):
+        """
+        sum of diff^2 * weights over the last two (pixel) dimensions. In single precision, the products are computed in
+        place and summed with numpy's pairwise summation instead of an einsum reduction to keep the sum accurate.
+
+        :param diff: model - data, overwritten in single precision
+        :param weights: mask / variance per pixel
+        :return: chi2 (for each model in the leading dimensions of diff)
+        """
+        if self._dtype is None:
+            return np.einsum('...ij,...ij,...ij->...', diff, diff, weights)
+        diff *= diff
+        diff *= weights
+        return np.sum(diff.reshape(diff.shape[:-2] + (-1,)), axis=-1).astype(np.float64)
+
+    def _log_likelihood_sparse(self, model, additional_error_map=0):
+        """
+        log likelihood evaluated on the pixels of the mask set with set_likelihood_mask() only
+
+        :param model: the model (same dimensions and units as data)
+        :param additional_error_map: additional error term (in same units as covariance matrix)
+        :return: the natural logarithm of the likelihood p(data|model)
+        """
+        index = self._mask_index
+        model_masked = model.ravel()[index]
+        diff = model_masked - self._data_masked
+        if np.isscalar(additional_error_map):
+            error_map = additional_error_map
+        else:
+            error_map = np.ravel(additional_error_map)[index]
+        if self._noise_map is not None:
+            if np.isscalar(error_map) and error_map == 0:
+                weights = self._inv_C_D_masked
+            else:
+                weights = 1. / (self._C_D_masked + np.abs(error_map))
+        else:
+            C_D = covariance_matrix(model_masked, self._background_rms, self._exp_map_masked)
+            weights = 1. / (C_D + np.abs(error_map))
+        return - np.einsum('i,i,i->', diff, diff, weights, dtype=np.float64) / 2
+
+    def log_likelihood_batch(self, models, mask, additional_error_map=0):
+        """
+        computes the likelihood p(data|model) for a set of models (e.g. the walkers of an ensemble sampler) in a
+        single vectorized evaluation. Same definition as log_likelihood() for each individual model.
+
+        :param models: 3d numpy array of shape (number of models, nx, ny)
+        :param mask: bool (1, 0) values per pixel. If =0, the pixel is ignored in the likelihood
+        :param additional_error_map: additional error term (in same units as covariance matrix), common to all models
+        :return: 1d numpy array of the natural logarithm of the likelihood for each model
+        """
+        if self._numba_likelihood is True or (self._noise_map is None and self._gradient_boost_factor is not None):
+            return np.array([self.log_likelihood(model, mask, additional_error_map) for model in models])
+        if self._noise_map is not None:
+            if np.isscalar(additional_error_map) and additional_error_map == 0:
+                weights = self._inv_C_D * mask
+            else:
+                weights = self._cast(mask / (self.C_D + np.abs(additional_error_map)))
+            return - self._chi2(self._subtract(models), weights) / 2
+        models = self._cast(models)
+        C_D = self.C_D_model(models)
+        weights = self._cast(mask / (C_D + np.abs(additional_error_map)))
+        return - self._chi2(models - self._data, weights) / 2
+
+    def reduced_residuals(self, model, mask, error_map=0):
+        """
+
+        :param model: 2d numpy array of the modeled image
+        :param mask: bool (1, 0) values per pixel. If =0, the pixel is ignored
+        :param error_map: 2d numpy array of additional noise/error terms from model components (such as PSF model
+         uncertainties)
+        :return: 2d numpy array of reduced residuals per pixel
+        """
+        model = self._cast(model)
+        if self._numba_likelihood is True:
+            from lenstronomy.Data import numba_likelihood
+            C_D = self._C_D_model_numba(model)
+            error_map = np.broadcast_to(error_map, np.shape(model))
+            mask = np.broadcast_to(mask, np.shape(model))
+            return numba_likelihood.reduced_residuals(model, self._data, C_D, mask, error_map)
+        residual = np.subtract(model, self._data, dtype=np.result_type(model, self._data, self._dtype or float))
+        if self._noise_map is not None and np.isscalar(error_map) and error_map == 0:
+            residual *= self._inv_sqrt_C_D
+        else:
+            C_D = self.C_D_model(model)
+            residual /= np.sqrt(C_D + np.abs(error_map))
+        residual *= mask
+        return residual
+
+    def _C_D_model_numba(self, model):
+        """
+        numba compiled version of C_D_model()
+
+        :param model: model (same as data but without noise)
+        :return: estimate of the noise per pixel based on the model flux
+        """
+        if self._noise_map is not None:
+            return self.C_D_model(model)
+        from lenstronomy.Data import numba_likelihood
+        if self._gradient_boost_factor is not None:
+            gradient_map = image_util.gradient_map(model) * self._gradient_boost_factor
+        else:
+            gradient_map = 0.
+        shape = np.shape(model)
+        return numba_likelihood.covariance_matrix(model, self._background_rms,
+                                                  np.broadcast_to(self._exp_map, shape),
+                                                  np.broadcast_to(gradient_map, shape))
@@ -0,0 +1,99 @@
+import numpy as np
+from numba import prange
+
+from lenstronomy.Util import numba_util
+
+__all__ = ['covariance_matrix', 'reduced_residuals', 'chi2', 'chi2_parallel']
+
+"""
+numba compiled kernels of the imaging likelihood. Each kernel performs a single pass over the pixels instead of
+allocating full-sized temporaries for each arithmetic operation.
+All arrays are 2d and of the same shape (scalar quantities can be passed with np.broadcast_to(value, shape)).
+"""
+
+
+@numba_util.jit(fastmath=True, nogil=True)
+def covariance_matrix(data, background_rms, exposure_map, gradient_map):
+    """
+    diagonal covariance matrix (see lenstronomy.Data.image_noise.covariance_matrix)
+
+    :param data: 2d data array, eg in units of photons/second
+    :param background_rms: float, background noise rms, eg. in units (photons/second)^2
+    :param exposure_map: 2d array, exposure time per pixel, e.g. in units of seconds
+    :param gradient_map: 2d array, additional noise term added in quadrature
+    :return: 2d array of variances per pixel; (photons/second)^2
+    """
+    nx, ny = data.shape
+    sigma_b2 = background_rms * background_rms
+    sigma = np.empty((nx, ny))
+    for i in range(nx):
+        for j in range(ny):
+            d = data[i, j]
+            if d < 0:
+                d = 0.
+            g = gradient_map[i, j]
+            sigma[i, j] = d / exposure_map[i, j] + sigma_b2 + g * g
+    return sigma
+
+
+@numba_util.jit(fastmath=True, nogil=True)
+def reduced_residuals(model, data, C_D, mask, error_map):
+    """
+    (model - data) / sqrt(C_D + |error_map|) * mask
+
+    :param model: 2d model array
+    :param data: 2d data array
+    :param C_D: 2d array of the diagonal covariance
+    :param mask: 2d array of (1, 0) or bool values, pixels with 0 are ignored
+    :param error_map: 2d array of additional error terms (in same units as C_D)
+    :return: 2d array of reduced residuals per pixel
+    """
+    nx, ny = model.shape
+    residuals = np.empty((nx, ny))
+    for i in range(nx):
+        for j in range(ny):
+            residuals[i, j] = (model[i, j] - data[i, j]) / np.sqrt(C_D[i, j] + abs(error_map[i, j])) * mask[i, j]
+    return residuals
+
+
+@numba_util.jit(fastmath=True, nogil=True)
+def chi2(model, data, C_D, mask, error_map):
+    """
+    sum of (model - data)^2 / (C_D + |error_map|) * mask
+
+    :param model: 2d model array
+    :param data: 2d data array
+    :param C_D: 2d array of the diagonal covariance
+    :param mask: 2d array of (1, 0) or bool values, pixels with 0 are ignored
+    :param error_map: 2d array of additional error terms (in same units as C_D)
+    :return: chi2 value
+    """
+    nx, ny = model.shape
+    x2 = 0.
+    for i in range(nx):
+        for j in range(ny):
+            diff = model[i, j] - data[i, j]
+            x2 += diff * diff / (C_D[i, j] + abs(error_map[i, j])) * mask[i, j]
+    return x2
+
+
+@numba_util.jit(parallel=True, fastmath=True, nogil=True)
+def chi2_parallel(model, data, C_D, mask, error_map):
+    """
+    multi-threaded version of chi2() with the rows of the image distributed over the numba threads.
+    Only beneficial for large images.
+
+    :param model: 2d model array
+    :param data: 2d data array
+    :param C_D: 2d array of the diagonal covariance
+    :param mask: 2d array of (1, 0) or bool values, pixels with 0 are ignored
+    :param error_map: 2d array of additional error terms (in same units as C_D)
+    :return: chi2 value
+    """
+    nx, ny = model.shape
+    x2 = 0.
+    for i in prange(nx):
+        for j in range(ny):
+            diff = model[i, j] - data[i, j]
+            x2 += diff * diff / (C_D[i, j] + abs(error_map[i, j])) * mask[i, j]
+    return x2
@@ -31,6 +31,7 @@ class PSF(object):
         self.psf_type = psf_type
         self._pixel_size = pixel_size
         self.kernel_point_source_init = kernel_point_source_init
+        self._kernel_supersampled_cache = {}
         if self.psf_type == 'GAUSSIAN':
             if fwhm is None:
                 raise ValueError('fwhm must be set for GAUSSIAN psf type!')
@@ -46,6 +47,7 @@ class PSF(object):
             if point_source_supersampling_factor > 1:
                 self._kernel_point_source_supersampled = kernel_point_source
                 self._point_source_supersampling_factor = point_source_supersampling_factor
+                self._kernel_supersampled_cache[point_source_supersampling_factor] = kernel_point_source
                 kernel_point_source = kernel_util.degrade_kernel(self._kernel_point_source_supersampled, self._point_source_supersampling_factor)
             self._kernel_point_source = kernel_point_source / np.sum(kernel_point_source)
 
@@ -95,6 +97,12 @@ class PSF(object):
         """
         if hasattr(self, '_kernel_point_source_supersampled') and self._point_source_supersampling_factor == supersampling_factor:
             kernel_point_source_supersampled = self._kernel_point_source_supersampled
+        elif supersampling_factor in self._kernel_supersampled_cache:
+            # previously computed kernel, e.g. for the point source rendering without updating the cache
+            kernel_point_source_supersampled = self._kernel_supersampled_cache[supersampling_factor]
+            if updata_cache is True:
+                self._kernel_point_source_supersampled = kernel_point_source_supersampled
+                self._point_source_supersampling_factor = supersampling_factor
         else:
             if self.psf_type == 'GAUSSIAN':
                 kernel_numPix = self._truncation / self._pixel_size * supersampling_factor
@@ -121,6 +129,7 @@ class PSF(object):
                 kernel_point_source_supersampled = self._kernel_point_source
             else:
                 raise ValueError('psf_type %s not valid!' % self.psf_type)
+            self._kernel_supersampled_cache[supersampling_factor] = kernel_point_source_supersampled
             if updata_cache is True:
                 self._kernel_point_source_supersampled = kernel_point_source_supersampled
                 self._point_source_supersampling_factor = supersampling_factor
@@ -139,6 +148,10 @@ class PSF(object):
                 del self._kernel_point_source
             except:
                 pass
+            # supersampled Gaussian kernels depend on the pixel size
+            self._kernel_supersampled_cache = {}
+            if hasattr(self, '_kernel_point_source_supersampled'):
+                del self._kernel_point_source_supersampled
 
     @property
     def psf_error_map(self):
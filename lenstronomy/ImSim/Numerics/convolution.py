@@ -1,9 +1,7 @@
-from scipy import fftpack, ndimage, signal
+from scipy import fft, ndimage, signal
 import numpy as np
-import threading
-#from scipy._lib._version import NumpyVersion
-_rfft_mt_safe = True  # (NumpyVersion(np.__version__) >= '1.9.0.dev-e24486e')
-_rfft_lock = threading.Lock()
+# kernels up to this number of elements are convolved directly, above it the (static) fft convolution is faster
+_direct_kernel_max_size = 9
 
 import lenstronomy.Util.kernel_util as kernel_util
 import lenstronomy.Util.util as util
@@ -28,17 +26,42 @@ class PixelKernelConvolution(object):
     """
     class to compute convolutions for a given pixelized kernel (fft, grid)
     """
-    def __init__(self, kernel, convolution_type='fft_static'):
+    def __init__(self, kernel, convolution_type='fft_static', workers=None):
         """
 
         :param kernel: 2d array, convolution kernel
-        :param convolution_type: string, 'fft', 'grid', 'fft_static' mode of 2d convolution
+        :param convolution_type: string, 'fft', 'grid', 'fft_static', 'fft_gpu' mode of 2d convolution.
+         'fft_static' stores the Fourier transformed kernel and convolves very small (up to 3x3) kernels directly on
+         the grid. 'fft_gpu' performs the fft convolution on a GPU with the Fourier transformed kernel stored on the
+         device (requires cupy).
+        :param workers: int or None, number of threads of the scipy.fft transforms in the 'fft_static' mode.
+         None uses the scipy default (which can be set with scipy.fft.set_workers()), -1 uses all CPUs.
         """
         self._kernel = kernel
-        if convolution_type not in ['fft', 'grid', 'fft_static']:
+        self._workers = workers
+        if convolution_type not in ['fft', 'grid', 'fft_static', 'fft_gpu']:
             raise ValueError('convolution_type %s not supported!' % convolution_type)
+        if convolution_type == 'fft_gpu':
+            try:
+                import cupy
+            except ImportError:
+                raise ImportError("convolution_type 'fft_gpu' requires the cupy package and a CUDA enabled GPU. "
+                                  "You can get it from here: https://cupy.dev")
         self._type = convolution_type
-        self._pre_computed = False
+        n_x, n_y = np.shape(kernel)
+        self._direct = kernel.size <= _direct_kernel_max_size and n_x % 2 == 1 and n_y % 2 == 1
+        self._static_cache = {}
+        # the convolution routine is selected once here and called without further dispatch in convolution2d()
+        if convolution_type == 'fft':
+            self._convolution_function = self._fft
+        elif convolution_type == 'grid':
+            self._convolution_function = self._grid
+        elif convolution_type == 'fft_gpu':
+            self._convolution_function = self._gpu_fft
+        elif self._direct is True:
+            self._convolution_function = self._direct_convolution
+        else:
+            self._convolution_function = self._static_fft
 
     def pixel_kernel(self, num_pix=None):
         """
@@ -56,7 +79,7 @@ class PixelKernelConvolution(object):
         
         :return: copy of the class with kernel set to the transpose of original one
         """
-        return PixelKernelConvolution(self._kernel.T, convolution_type=self._type)
+        return PixelKernelConvolution(self._kernel.T, convolution_type=self._type, workers=self._workers)
 
     def convolution2d(self, image):
         """
@@ -64,15 +87,35 @@ class PixelKernelConvolution(object):
         :param image: 2d array (image) to be convolved
         :return: fft convolution
         """
-        if self._type == 'fft':
-            image_conv = signal.fftconvolve(image, self._kernel, mode='same')
-        elif self._type == 'fft_static':
-            image_conv = self._static_fft(image, mode='same')
-        elif self._type == 'grid':
-            image_conv = signal.convolve2d(image, self._kernel, mode='same')
-        else:
-            raise ValueError('convolution_type %s not supported!' % self._type)
-        return image_conv
+        return self._convolution_function(image)
+
+    def _fft(self, image):
+        """
+        scipy fft convolution
+
+        :param image: 2d numpy array to be convolved
+        :return: convolved image
+        """
+        return signal.fftconvolve(image, self._kernel, mode='same')
+
+    def _grid(self, image):
+        """
+        convolution on the pixel grid
+
+        :param image: 2d numpy array to be convolved
+        :return: convolved image
+        """
+        return signal.convolve2d(image, self._kernel, mode='same')
+
+    def _direct_convolution(self, image):
+        """
+        direct convolution for very small kernels (used in 'fft_static' mode)
+
+        :param image: 2d numpy array to be convolved
+        :return: convolved image
+        """
+        output = np.result_type(image, self._kernel, float)
+        return ndimage.convolve(image, self._kernel, output=output, mode='constant', cval=0.)
 
     def _static_fft(self, image, mode='same'):
         """
@@ -81,44 +124,18 @@ class PixelKernelConvolution(object):
         :param image: 2d numpy array to be convolved
         :return:
         """
-        in1 = image
-        in1 = np.asarray(in1)
-        if self._pre_computed is False:
-            self._s1, self._s2, self._complex_result, self._shape, self._fshape, self._fslice, self._sp2 = self._static_pre_compute(image)
-            self._pre_computed = True
-        s1, s2, complex_result, shape, fshape, fslice, sp2 = self._s1, self._s2, self._complex_result, self._shape, self._fshape, self._fslice, self._sp2
-        #if in1.ndim == in2.ndim == 0:  # scalar inputs
-        #    return in1 * in2
-        #elif not in1.ndim == in2.ndim:
-        #    raise ValueError("in1 and in2 should have the same dimensionality")
-        #elif in1.size == 0 or in2.size == 0:  # empty arrays
-        #    return np.array([])
-
-
-        # Check that input sizes are compatible with 'valid' mode
-        #if _inputs_swap_needed(mode, s1, s2):
-            # Convolution is commutative; order doesn't have any effect on output
-            # only applicable for 'valid' mode
-        #    in1, s1, in2, s2 = in2, s2, in1, s1
-
-        # Pre-1.9 NumPy FFT routines are not threadsafe.  For older NumPys, make
-        # sure we only call rfftn/irfftn from one thread at a time.
-        if not complex_result and (_rfft_mt_safe or _rfft_lock.acquire(False)):
-            try:
-                sp1 = np.fft.rfftn(in1, fshape)
-                ret = (np.fft.irfftn(sp1 * sp2, fshape)[fslice].copy())
-            finally:
-                if not _rfft_mt_safe:
-                    _rfft_lock.release()
+        in1 = np.asarray(image)
+        # the Fourier transformed kernel is stored for each image shape it is applied to
+        if in1.shape not in self._static_cache:
+            self._static_cache[in1.shape] = self._static_pre_compute(in1)
+        s1, s2, complex_result, shape, fshape, fslice, sp2 = self._static_cache[in1.shape]
+
+        if not complex_result:
+            sp1 = fft.rfftn(in1, fshape, workers=self._workers)
+            ret = fft.irfftn(sp1 * sp2, fshape, workers=self._workers)[fslice].copy()
         else:
-            # If we're here, it's either because we need a complex result, or we
-            # failed to acquire _rfft_lock (meaning rfftn isn't threadsafe and
-            # is already in use by another thread).  In either case, use the
-            # (threadsafe but slower) SciPy complex-FFT routines instead.
-            sp1 = fftpack.fftn(in1, fshape)
-            ret = fftpack.ifftn(sp1 * sp2)[fslice].copy()
-            if not complex_result:
-                ret = ret.real
+            sp1 = fft.fftn(in1, fshape, workers=self._workers)
+            ret = fft.ifftn(sp1 * sp2, workers=self._workers)[fslice].copy()
 
         if mode == "full":
             return ret
@@ -145,31 +162,35 @@ class PixelKernelConvolution(object):
                           np.issubdtype(in2.dtype, np.complexfloating))
         shape = s1 + s2 - 1
 
-        # Check that input sizes are compatible with 'valid' mode
-        # if _inputs_swap_needed(mode, s1, s2):
-        # Convolution is commutative; order doesn't have any effect on output
-        # only applicable for 'valid' mode
-        #    in1, s1, in2, s2 = in2, s2, in1, s1
-
-        # Speed up FFT by padding to optimal size for FFTPACK
-        fshape = [fftpack.helper.next_fast_len(int(d)) for d in shape]
+        # Speed up FFT by padding to optimal size (small prime factors) for pocketfft
+        fshape = [fft.next_fast_len(int(d), not complex_result) for d in shape]
         fslice = tuple([slice(0, int(sz)) for sz in shape])
-        # Pre-1.9 NumPy FFT routines are not threadsafe.  For older NumPys, make
-        # sure we only call rfftn/irfftn from one thread at a time.
-        if not complex_result and (_rfft_mt_safe or _rfft_lock.acquire(False)):
-            try:
-                sp2 = np.fft.rfftn(in2, fshape)
-            finally:
-                if not _rfft_mt_safe:
-                    _rfft_lock.release()
+        if not complex_result:
+            sp2 = fft.rfftn(in2, fshape, workers=self._workers)
         else:
-            # If we're here, it's either because we need a complex result, or we
-            # failed to acquire _rfft_lock (meaning rfftn isn't threadsafe and
-            # is already in use by another thread).  In either case, use the
-            # (threadsafe but slower) SciPy complex-FFT routines instead.
-            sp2 = fftpack.fftn(in2, fshape)
+            sp2 = fft.fftn(in2, fshape, workers=self._workers)
         return s1, s2, complex_result, shape, fshape, fslice, sp2
 
+    def _gpu_fft(self, image):
+        """
+        fft convolution on a GPU with cupy, with the Fourier transformed kernel stored on the device
+
+        :param image: 2d numpy array to be convolved
+        :return: convolved image with the same shape as image, 2d numpy array
+        """
+        import cupy as cp
+        in1 = cp.asarray(image)
+        if in1.shape not in self._static_cache:
+            s1 = np.array(in1.shape)
+            shape = s1 + np.array(self._kernel.shape) - 1
+            fshape = [fft.next_fast_len(int(d), True) for d in shape]
+            fslice = tuple([slice(0, int(sz)) for sz in shape])
+            sp2 = cp.fft.rfftn(cp.asarray(self._kernel), fshape)
+            self._static_cache[in1.shape] = s1, fshape, fslice, sp2
+        s1, fshape, fslice, sp2 = self._static_cache[in1.shape]
+        ret = cp.fft.irfftn(cp.fft.rfftn(in1, fshape) * sp2, fshape)[fslice]
+        return cp.asnumpy(_centered(ret, s1))
+
     def re_size_convolve(self, image_low_res, image_high_res=None):
         """
 
@@ -184,13 +205,16 @@ class SubgridKernelConvolution(object):
     """
     class to compute the convolution on a supersampled grid with partial convolution computed on the regular grid
     """
-    def __init__(self, kernel_supersampled, supersampling_factor, supersampling_kernel_size=None, convolution_type='fft_static'):
+    def __init__(self, kernel_supersampled, supersampling_factor, supersampling_kernel_size=None, convolution_type='fft_static',
+                 workers=None):
         """
 
         :param kernel_supersampled: kernel in supersampled pixels
         :param supersampling_factor: supersampling factor relative to the image pixel grid
         :param supersampling_kernel_size: number of pixels (in units of the image pixels) that are convolved with the
         supersampled kernel
+        :param convolution_type: string, 'fft', 'grid', 'fft_static', 'fft_gpu' mode of 2d convolution
+        :param workers: int or None, number of threads of the scipy.fft transforms (see PixelKernelConvolution)
         """
         n_high = len(kernel_supersampled)
         self._supersampling_factor = supersampling_factor
@@ -206,8 +230,8 @@ class SubgridKernelConvolution(object):
             kernel_low_res, kernel_high_res = kernel_util.split_kernel(kernel_supersampled, supersampling_kernel_size,
                                                                        self._supersampling_factor)
             self._low_res_convolution = True
-        self._low_res_conv = PixelKernelConvolution(kernel_low_res, convolution_type=convolution_type)
-        self._high_res_conv = PixelKernelConvolution(kernel_high_res, convolution_type=convolution_type)
+        self._low_res_conv = PixelKernelConvolution(kernel_low_res, convolution_type=convolution_type, workers=workers)
+        self._high_res_conv = PixelKernelConvolution(kernel_high_res, convolution_type=convolution_type, workers=workers)
 
     def convolution2d(self, image):
         """
@@ -182,8 +182,10 @@ class RegularGrid(Coordinates1D):
         if flux_evaluate_indexes is None:
             flux_evaluate_indexes = np.ones_like(self._x_grid, dtype=bool)
         else:
-            flux_evaluate_indexes = util.image2array(flux_evaluate_indexes)
+            flux_evaluate_indexes = util.image2array(np.array(flux_evaluate_indexes, dtype=bool))
         self._compute_indexes = self._subgrid_index(flux_evaluate_indexes, self._supersampling_factor, self._nx, self._ny)
+        if not np.all(self._compute_indexes):
+            self._compute_indexes = np.flatnonzero(self._compute_indexes)
 
         x_grid_sub, y_grid_sub = util.make_subgrid(self._x_grid, self._y_grid, self._supersampling_factor)
         self._ra_subgrid = x_grid_sub[self._compute_indexes]
@@ -242,11 +244,9 @@ class RegularGrid(Coordinates1D):
         :param subgrid_res: subgrid resolution
         :return: 1d array of equivalent mask in subgrid resolution
         """
-        idex_sub = np.repeat(idex_mask, subgrid_res, axis=0)
-        idex_sub = util.array2image(idex_sub, nx=nx, ny=ny*subgrid_res)
-        idex_sub = np.repeat(idex_sub, subgrid_res, axis=0)
-        idex_sub = util.image2array(idex_sub)
-        return idex_sub
+        idex_image = util.array2image(idex_mask, nx=nx, ny=ny)
+        idex_sub = np.broadcast_to(idex_image[:, None, :, None], (nx, subgrid_res, ny, subgrid_res))
+        return idex_sub.reshape(nx * subgrid_res * ny * subgrid_res)
 
     def _array2image(self, array):
         """
@@ -38,7 +38,7 @@ class Numerics(PointSourceRendering):
         consistency.
         :param point_source_supersampling_factor: super-sampling resolution of the point source placing
         :param convolution_kernel_size: int, odd number, size of convolution kernel. If None, takes size of point_source_kernel
-        :param convolution_type: string, 'fft', 'grid', 'fft_static' mode of 2d convolution
+        :param convolution_type: string, 'fft', 'grid', 'fft_static', 'fft_gpu' mode of 2d convolution
         """
         if compute_mode not in ['regular', 'adaptive']:
             raise ValueError('compute_mode specified as %s not valid. Options are "adaptive", "regular"')
@@ -72,10 +72,8 @@ class Numerics(PointSourceRendering):
 
             elif compute_mode == 'regular' and supersampling_convolution is True:
                 kernel_super = psf.kernel_point_source_supersampled(supersampling_factor)
-                if convolution_kernel_size is not None:
-                    kernel_super = psf.kernel_point_source_supersampled(supersampling_factor)
-                    kernel_super = self._supersampling_cut_kernel(kernel_super, convolution_kernel_size,
-                                                                  supersampling_factor)
+                kernel_super = self._supersampling_cut_kernel(kernel_super, convolution_kernel_size,
+                                                              supersampling_factor)
                 self._conv = SubgridKernelConvolution(kernel_super, supersampling_factor,
                                                       supersampling_kernel_size=supersampling_kernel_size,
                                                       convolution_type=convolution_type)
@@ -16,7 +16,7 @@ class PartialImage(object):
         """
         self._partial_read_bools = np.array(partial_read_bools, dtype=bool)
         self._nx, self._ny = np.shape(partial_read_bools)
-        self._partial_read_bools_array = util.image2array(partial_read_bools)
+        self._partial_read_bools_array = util.image2array(self._partial_read_bools)
         self._num_partial = int(np.sum(self._partial_read_bools_array))
 
     def partial_array(self, image):
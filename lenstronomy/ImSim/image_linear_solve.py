@@ -35,7 +35,10 @@ class ImageLinearFit(ImageModel):
         if likelihood_mask is None:
             likelihood_mask = np.ones_like(data_class.data)
         self.likelihood_mask = np.array(likelihood_mask, dtype=bool)
+        self._num_data_evaluate = int(np.sum(self.likelihood_mask))
         self._mask1d = util.image2array(self.likelihood_mask)
+        if not np.all(self._mask1d):
+            self._mask1d = np.flatnonzero(self._mask1d)
         #kwargs_numerics['compute_indexes'] = self.likelihood_mask  # here we overwrite the indexes to be computed with the likelihood mask
         super(ImageLinearFit, self).__init__(data_class, psf_class=psf_class, lens_model_class=lens_model_class,
                                              source_model_class=source_model_class,
@@ -45,6 +48,7 @@ class ImageLinearFit(ImageModel):
         if psf_error_map_bool_list is None:
             psf_error_map_bool_list = [True] * len(self.PointSource.point_source_type_list)
         self._psf_error_map_bool_list = psf_error_map_bool_list
+        self.Data.set_likelihood_mask(self.likelihood_mask)
         if self._pixelbased_bool is True:
             # update the pixel-based solver with the likelihood mask
             self.PixelSolver.set_likelihood_mask(self.likelihood_mask)
@@ -334,10 +338,7 @@ class ImageLinearFit(ImageModel):
         :param error_map: 2d numpy array of additional noise/error terms from model components (such as PSF model uncertainties)
         :return: 2d numpy array of reduced residuals per pixel
         """
-        mask = self.likelihood_mask
-        C_D = self.Data.C_D_model(model)
-        residual = (model - self.Data.data)/np.sqrt(C_D+np.abs(error_map))*mask
-        return residual
+        return self.Data.reduced_residuals(model, self.likelihood_mask, error_map)
 
     def reduced_chi2(self, model, error_map=0):
         """
@@ -346,8 +347,8 @@ class ImageLinearFit(ImageModel):
         :param error_map:
         :return:
         """
-        chi2 = self.reduced_residuals(model, error_map)
-        return np.sum(chi2**2) / self.num_data_evaluate
+        chi2 = - 2 * self.Data.log_likelihood(model, self.likelihood_mask, error_map)
+        return chi2 / self.num_data_evaluate
 
     @property
     def num_data_evaluate(self):
@@ -355,7 +356,7 @@ class ImageLinearFit(ImageModel):
         number of data points to be used in the linear solver
         :return:
         """
-        return int(np.sum(self.likelihood_mask))
+        return self._num_data_evaluate
 
     def update_data(self, data_class):
         """
@@ -364,6 +365,7 @@ class ImageLinearFit(ImageModel):
         :return: no return. Class is updated.
         """
         self.Data = data_class
+        self.Data.set_likelihood_mask(self.likelihood_mask)
         self.ImageNumerics._PixelGrid = data_class
 
     def image2array_masked(self, image):
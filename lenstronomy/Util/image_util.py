@@ -203,7 +203,8 @@ def re_size(image, factor=1):
     f = int(factor)
     nx, ny = np.shape(image)
     if int(nx/f) == nx/f and int(ny/f) == ny/f:
-        small = image.reshape([int(nx/f), f, int(ny/f), f]).mean(3).mean(1)
+        # summing over the rows of each block first is a contiguous vectorized add and much faster than mean(3)
+        small = image.reshape([int(nx/f), f, int(ny/f), f]).sum(axis=1).sum(axis=2) / (f * f)
         return small
     else:
         raise ValueError("scaling with factor %s is not possible with grid size %s, %s" %(f, nx, ny))
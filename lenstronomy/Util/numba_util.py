@@ -12,12 +12,14 @@ If on super computer:
 nopython = True
 cache = True
 parallel = False
+fastmath = False
+nogil = False
 
 __all__ = ['jit']
 
 
-def jit(nopython=nopython, cache=cache, parallel=parallel):
+def jit(nopython=nopython, cache=cache, parallel=parallel, fastmath=fastmath, nogil=nogil):
     def wrapper(func):
-        return numba.jit(func, nopython=nopython, cache=cache, parallel=parallel)
+        return numba.jit(func, nopython=nopython, cache=cache, parallel=parallel, fastmath=fastmath, nogil=nogil)
 
     return wrapper
@@ -120,9 +120,10 @@ def array2image(array, nx=0, ny=0):
     :raises: AttributeError, KeyError
     """
     if nx == 0 or ny == 0:
-        n = int(np.sqrt(len(array)))
-        if n**2 != len(array):
-            raise ValueError("lenght of input array given as %s is not square of integer number!" %(len(array)))
+        num = len(array)
+        n = int(round(np.sqrt(num)))
+        if n * n != num:
+            raise ValueError("lenght of input array given as %s is not square of integer number!" % num)
         nx, ny = n, n
     image = array.reshape(int(nx), int(ny))
     return image
@@ -157,8 +158,8 @@ def array2cube(array, n_1, n_23):
     :returns: 3d array
     :raises ValueError: when n_23 is not a perfect square
     """
-    n = int(np.sqrt(n_23))
-    if n**2 != n_23:
+    n = int(round(np.sqrt(n_23)))
+    if n * n != n_23:
         raise ValueError("2nd and 3rd dims (%s) are not square of integer number!" % n_23)
     n_2, n_3 = n, n
     cube = array.reshape(n_1, n_2, n_3)
@@ -308,8 +309,8 @@ def get_axes(x, y):
     :param y:
     :return:
     """
-    n=int(np.sqrt(len(x)))
-    if n**2 != len(x):
+    n = int(round(np.sqrt(len(x))))
+    if n * n != len(x):
         raise ValueError("lenght of input array given as %s is not square of integer number!" % (len(x)))
     x_image = x.reshape(n,n)
     y_image = y.reshape(n,n)
@@ -38,7 +38,7 @@ The full documentation can be generated with Sphinx"""
 history = open('HISTORY.rst').read().replace('.. :changelog:', '')
 
 desc = open("README.rst").read()
-requires = ['numpy>=1.13', 'scipy>=0.14.0', "configparser"]
+requires = ['numpy>=1.13', 'scipy>=1.4.0', "configparser"]
 tests_require=['pytest>=2.3', "mock"]
 
 PACKAGE_PATH = os.path.abspath(os.path.join(__file__, os.pardir))
@@ -26,6 +26,10 @@ class TestData(object):
         assert result[0] == 1.1
         assert result[1] == 1.2
 
+        d = np.array([-1, np.nan, 3])
+        result = image_noise.covariance_matrix(d, sigma_b, f)
+        npt.assert_almost_equal(result, [1, 1, 1.3], decimal=10)
+
     def test_noise_map(self):
         noise_map = np.ones((self.numPix, self.numPix))
         kwargs_noise = {'image_data': np.zeros((self.numPix, self.numPix)), 'exposure_time': 1, 'background_rms': 1,
@@ -5,6 +5,8 @@ import copy
 import unittest
 
 from lenstronomy.Data.imaging_data import ImageData
+from lenstronomy.Data.psf import PSF
+from lenstronomy.ImSim.image_linear_solve import ImageLinearFit
 import lenstronomy.Util.util as util
 
 
@@ -14,6 +16,17 @@ class TestData(object):
         kwargs_data = {'image_data': np.zeros((self.numPix, self.numPix)), 'noise_map': np.ones((self.numPix, self.numPix))}
         self.Data = ImageData(**kwargs_data)
 
+        np.random.seed(42)
+        self.model = np.random.normal(loc=1, size=(self.numPix, self.numPix))
+        self.image_data = self.model + np.random.normal(size=(self.numPix, self.numPix))
+        self.mask = np.ones((self.numPix, self.numPix), dtype=bool)
+        self.mask[0, :] = False
+        self.error_map = np.random.uniform(size=(self.numPix, self.numPix))
+        self.kwargs_data_list = [{'image_data': self.image_data, 'noise_map': np.ones((self.numPix, self.numPix))},
+                                 {'image_data': self.image_data, 'exposure_time': 10, 'background_rms': 1},
+                                 {'image_data': self.image_data,
+                                  'exposure_time': np.ones((self.numPix, self.numPix)) * 10., 'background_rms': 0.5}]
+
     def test_numData(self):
         assert self.Data.num_pixel == self.numPix ** 2
 
@@ -89,6 +102,113 @@ class TestData(object):
         data_new = data.data
         npt.assert_almost_equal(data_new, np.ones((self.numPix, self.numPix)))
 
+    def test_log_likelihood(self):
+        model, image_data, mask = self.model, self.image_data, self.mask
+        noise_map = np.random.uniform(low=0.5, high=2, size=(self.numPix, self.numPix))
+        data = ImageData(image_data=image_data, noise_map=noise_map)
+        logL = data.log_likelihood(model, mask, additional_error_map=0)
+        logL_true = - np.sum((model - image_data) ** 2 / noise_map ** 2 * mask) / 2
+        npt.assert_almost_equal(logL, logL_true, decimal=8)
+        logL = data.log_likelihood(model, mask, additional_error_map=np.zeros_like(model))
+        npt.assert_almost_equal(logL, logL_true, decimal=8)
+
+        residuals = data.reduced_residuals(model, mask, error_map=0)
+        residuals_true = (model - image_data) / noise_map * mask
+        npt.assert_almost_equal(residuals, residuals_true, decimal=8)
+        residuals = data.reduced_residuals(model, mask, error_map=np.zeros_like(model))
+        npt.assert_almost_equal(residuals, residuals_true, decimal=8)
+
+    def test_log_likelihood_mask_broadcast(self):
+        mask_1d = np.ones(self.numPix)
+        mask_1d[0] = 0
+        for kwargs_data in self.kwargs_data_list:
+            for numba_likelihood in [False, True]:
+                data = ImageData(numba_likelihood=numba_likelihood, **kwargs_data)
+                for mask in [1, mask_1d]:
+                    mask_2d = np.broadcast_to(mask, (self.numPix, self.numPix)) * np.ones((self.numPix, self.numPix))
+                    npt.assert_almost_equal(data.log_likelihood(self.model, mask),
+                                            data.log_likelihood(self.model, mask_2d), decimal=8)
+                    npt.assert_almost_equal(data.reduced_residuals(self.model, mask),
+                                            data.reduced_residuals(self.model, mask_2d), decimal=8)
+
+    def test_numba_likelihood(self):
+        for kwargs_data in self.kwargs_data_list:
+            data = ImageData(**kwargs_data)
+            data_numba = ImageData(numba_likelihood=True, **kwargs_data)
+            data_numba_parallel = ImageData(numba_likelihood=True, numba_parallel=True, **kwargs_data)
+            for additional_error_map in [0, self.error_map]:
+                logL = data.log_likelihood(self.model, self.mask, additional_error_map)
+                logL_numba = data_numba.log_likelihood(self.model, self.mask, additional_error_map)
+                npt.assert_almost_equal(logL_numba, logL, decimal=8)
+                logL_numba_parallel = data_numba_parallel.log_likelihood(self.model, self.mask, additional_error_map)
+                npt.assert_almost_equal(logL_numba_parallel, logL, decimal=8)
+                residuals = data.reduced_residuals(self.model, self.mask, additional_error_map)
+                residuals_numba = data_numba.reduced_residuals(self.model, self.mask, additional_error_map)
+                npt.assert_almost_equal(residuals_numba, residuals, decimal=8)
+
+    def test_log_likelihood_batch(self):
+        models = np.array([self.model, self.model + 0.1, self.model - 0.2, self.model * 2])
+        for kwargs_data in self.kwargs_data_list:
+            data = ImageData(**kwargs_data)
+            for additional_error_map in [0, self.error_map]:
+                logL_batch = data.log_likelihood_batch(models, self.mask, additional_error_map)
+                assert len(logL_batch) == len(models)
+                for i, model in enumerate(models):
+                    npt.assert_almost_equal(logL_batch[i], data.log_likelihood(model, self.mask, additional_error_map),
+                                            decimal=8)
+
+    def test_sparse_likelihood_mask(self):
+        mask = np.zeros((self.numPix, self.numPix), dtype=bool)
+        mask[3:7, 2:8] = True
+        for kwargs_data in self.kwargs_data_list:
+            data = ImageData(**kwargs_data)
+            data_sparse = ImageData(**kwargs_data)
+            data_sparse.set_likelihood_mask(mask)
+            assert data_sparse._mask_index is not None
+            for additional_error_map in [0, self.error_map]:
+                logL = data.log_likelihood(self.model, mask, additional_error_map)
+                logL_sparse = data_sparse.log_likelihood(self.model, mask, additional_error_map)
+                npt.assert_almost_equal(logL_sparse, logL, decimal=8)
+
+            image_data_new = self.image_data + 1
+            data.update_data(image_data_new)
+            data_sparse.update_data(image_data_new)
+            npt.assert_almost_equal(data_sparse.log_likelihood(self.model, mask),
+                                    data.log_likelihood(self.model, mask), decimal=8)
+
+        data = ImageData(**self.kwargs_data_list[0])
+        mask_full = np.ones((self.numPix, self.numPix), dtype=bool)
+        logL = data.log_likelihood(self.model, mask_full)
+        data.set_likelihood_mask(mask_full)
+        assert data._mask_index is None
+        npt.assert_almost_equal(data.log_likelihood(self.model, mask_full), logL, decimal=8)
+
+    def test_sparse_likelihood_mask_no_exposure_map(self):
+        mask = np.zeros((self.numPix, self.numPix), dtype=bool)
+        mask[3:7, 2:8] = True
+        data = ImageData(image_data=np.zeros((self.numPix, self.numPix)), background_rms=1)
+        data.set_likelihood_mask(mask)
+        assert data._mask_index is None
+
+        kwargs_numerics = {'supersampling_factor': 1}
+        image_model = ImageLinearFit(data_class=data, psf_class=PSF(psf_type='NONE'),
+                                     kwargs_numerics=kwargs_numerics, likelihood_mask=mask)
+        assert image_model.num_data_evaluate == 4 * 6
+
+    def test_precision(self):
+        for kwargs_data in self.kwargs_data_list:
+            data = ImageData(**kwargs_data)
+            data_float32 = ImageData(precision='float32', **kwargs_data)
+            assert data_float32.data.dtype == np.float32
+            logL = data.log_likelihood(self.model, self.mask)
+            logL_float32 = data_float32.log_likelihood(self.model, self.mask)
+            assert isinstance(logL_float32, np.float64)
+            npt.assert_almost_equal(logL_float32 / logL, 1, decimal=5)
+            logL_batch_float32 = data_float32.log_likelihood_batch(np.array([self.model, self.model + 0.1]), self.mask)
+            npt.assert_almost_equal(logL_batch_float32[0] / logL, 1, decimal=5)
+            residuals_float32 = data_float32.reduced_residuals(self.model, self.mask)
+            npt.assert_almost_equal(residuals_float32, data.reduced_residuals(self.model, self.mask), decimal=5)
+
 
 class TestRaise(unittest.TestCase):
 
@@ -98,6 +218,8 @@ class TestRaise(unittest.TestCase):
         image_data_new = np.zeros((5, 5))
         with self.assertRaises(ValueError):
             out = Data.update_data(image_data_new)
+        with self.assertRaises(ValueError):
+            ImageData(precision='float16', **kwargs_data)
 
 
 if __name__ == '__main__':
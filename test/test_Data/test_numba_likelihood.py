@@ -0,0 +1,49 @@
+import pytest
+import numpy as np
+import numpy.testing as npt
+
+import lenstronomy.Data.numba_likelihood as numba_likelihood
+import lenstronomy.Data.image_noise as image_noise
+
+
+class TestNumbaLikelihood(object):
+
+    def setup(self):
+        np.random.seed(41)
+        self.shape = (10, 12)
+        self.model = np.random.normal(loc=1, size=self.shape)
+        self.data = self.model + np.random.normal(size=self.shape)
+        self.C_D = np.random.uniform(low=0.5, high=2, size=self.shape)
+        self.mask = np.ones(self.shape, dtype=bool)
+        self.mask[:, 0] = False
+        self.error_map = np.random.uniform(size=self.shape)
+
+    def test_covariance_matrix(self):
+        exposure_map = np.random.uniform(low=1, high=10, size=self.shape)
+        sigma = numba_likelihood.covariance_matrix(self.data, 0.5, exposure_map, np.zeros(self.shape))
+        sigma_true = image_noise.covariance_matrix(self.data, 0.5, exposure_map)
+        npt.assert_almost_equal(sigma, sigma_true, decimal=10)
+
+        sigma = numba_likelihood.covariance_matrix(self.data, 0.5, np.broadcast_to(10., self.shape),
+                                                   np.broadcast_to(0., self.shape))
+        sigma_true = image_noise.covariance_matrix(self.data, 0.5, 10.)
+        npt.assert_almost_equal(sigma, sigma_true, decimal=10)
+
+    def test_reduced_residuals(self):
+        residuals = numba_likelihood.reduced_residuals(self.model, self.data, self.C_D, self.mask, self.error_map)
+        residuals_true = (self.model - self.data) / np.sqrt(self.C_D + self.error_map) * self.mask
+        npt.assert_almost_equal(residuals, residuals_true, decimal=10)
+
+    def test_chi2(self):
+        x2 = numba_likelihood.chi2(self.model, self.data, self.C_D, self.mask, self.error_map)
+        x2_true = np.sum((self.model - self.data) ** 2 / (self.C_D + self.error_map) * self.mask)
+        npt.assert_almost_equal(x2, x2_true, decimal=8)
+
+    def test_chi2_parallel(self):
+        x2 = numba_likelihood.chi2_parallel(self.model, self.data, self.C_D, self.mask, self.error_map)
+        x2_serial = numba_likelihood.chi2(self.model, self.data, self.C_D, self.mask, self.error_map)
+        npt.assert_almost_equal(x2, x2_serial, decimal=8)
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -88,6 +88,17 @@ class TestData(object):
         kernel_super = psf_none.kernel_point_source_supersampled(supersampling_factor=5)
         npt.assert_almost_equal(kernel_super, psf_none.kernel_point_source, decimal=9)
 
+    def test_kernel_supersampled_cache(self):
+        kernel_super = self.psf_pixel.kernel_point_source_supersampled(supersampling_factor=3, updata_cache=False)
+        assert not hasattr(self.psf_pixel, '_kernel_point_source_supersampled')
+        kernel_super_new = self.psf_pixel.kernel_point_source_supersampled(supersampling_factor=3, updata_cache=False)
+        assert kernel_super_new is kernel_super
+
+        kernel_super = self.psf_gaussian.kernel_point_source_supersampled(supersampling_factor=3)
+        self.psf_gaussian.set_pixel_size(self.deltaPix * 2)
+        kernel_super_new = self.psf_gaussian.kernel_point_source_supersampled(supersampling_factor=3)
+        assert len(kernel_super_new) < len(kernel_super)
+
     def test_fwhm(self):
         deltaPix = 1.
         fwhm = 5.6
@@ -26,6 +26,63 @@ class TestPixelKernelConvolution(object):
         image_convolved = pixel_conv.convolution2d(self.model)
         npt.assert_almost_equal(np.sum(image_convolved), np.sum(self.model), decimal=2)
 
+    def test_static_fft_direct(self):
+        kernel = np.zeros((3, 3))
+        kernel[1, 1] = 0.5
+        kernel[0, 1] = 0.3
+        kernel[2, 2] = 0.2
+        pixel_conv_static = PixelKernelConvolution(kernel=kernel, convolution_type='fft_static')
+        pixel_conv_fft = PixelKernelConvolution(kernel=kernel, convolution_type='fft')
+        image_convolved_static = pixel_conv_static.convolution2d(self.model)
+        image_convolved_fft = pixel_conv_fft.convolution2d(self.model)
+        npt.assert_almost_equal(image_convolved_static, image_convolved_fft, decimal=10)
+
+        # integer images are convolved to floats as in the fft convolution
+        kernel = np.ones((3, 3)) / 9.
+        image = np.zeros((5, 5), dtype=int)
+        image[2, 2] = 9
+        pixel_conv_static = PixelKernelConvolution(kernel=kernel, convolution_type='fft_static')
+        pixel_conv_fft = PixelKernelConvolution(kernel=kernel, convolution_type='fft')
+        image_convolved_static = pixel_conv_static.convolution2d(image)
+        assert image_convolved_static.dtype == float
+        npt.assert_almost_equal(image_convolved_static, pixel_conv_fft.convolution2d(image), decimal=10)
+
+    def test_static_fft_shapes(self):
+        kernel = np.zeros((5, 5))
+        kernel[2, 2] = 0.5
+        kernel[0, 1] = 0.3
+        kernel[4, 3] = 0.2
+        pixel_conv_static = PixelKernelConvolution(kernel=kernel, convolution_type='fft_static')
+        pixel_conv_fft = PixelKernelConvolution(kernel=kernel, convolution_type='fft')
+        for image in [self.model, self.model[1:-1, :]]:
+            image_convolved_static = pixel_conv_static.convolution2d(image)
+            image_convolved_fft = pixel_conv_fft.convolution2d(image)
+            npt.assert_almost_equal(image_convolved_static, image_convolved_fft, decimal=10)
+
+    def test_static_fft_workers(self):
+        kernel = np.ones((5, 5)) / 25.
+        pixel_conv = PixelKernelConvolution(kernel=kernel, convolution_type='fft')
+        pixel_conv_workers = PixelKernelConvolution(kernel=kernel, convolution_type='fft_static', workers=-1)
+        image_convolved = pixel_conv.convolution2d(self.model)
+        image_convolved_workers = pixel_conv_workers.convolution2d(self.model)
+        npt.assert_almost_equal(image_convolved_workers, image_convolved, decimal=10)
+        image_convolved_workers = pixel_conv_workers.copy_transpose().convolution2d(self.model)
+        npt.assert_almost_equal(image_convolved_workers, image_convolved, decimal=10)
+
+    def test_fft_gpu(self):
+        kernel = np.ones((5, 5)) / 25.
+        try:
+            import cupy
+        except ImportError:
+            with pytest.raises(ImportError):
+                PixelKernelConvolution(kernel=kernel, convolution_type='fft_gpu')
+        else:
+            pixel_conv = PixelKernelConvolution(kernel=kernel, convolution_type='fft')
+            pixel_conv_gpu = PixelKernelConvolution(kernel=kernel, convolution_type='fft_gpu')
+            image_convolved = pixel_conv.convolution2d(self.model)
+            image_convolved_gpu = pixel_conv_gpu.convolution2d(self.model)
+            npt.assert_almost_equal(image_convolved_gpu, image_convolved, decimal=10)
+
     def test_copy_transpose(self):
         kernel = np.zeros((3, 3))
         kernel[1, 1] = 1
@@ -96,5 +96,32 @@ class TestRegularGrid(object):
         ssf = self._regular_grid.supersampling_factor
         assert ssf == self._supersampling_factor
 
+    def test_flux_evaluate_indexes(self):
+        transform_pix2angle = np.array([[1, 0], [0, 1]]) * self._deltaPix
+        flux_evaluate_indexes = np.zeros((self.nx, self.ny), dtype=int)
+        flux_evaluate_indexes[3:6, 4:8] = 1
+        grid_int = RegularGrid(self.nx, self.ny, transform_pix2angle, -5, -5, supersampling_factor=2,
+                               flux_evaluate_indexes=flux_evaluate_indexes)
+        grid_bool = RegularGrid(self.nx, self.ny, transform_pix2angle, -5, -5, supersampling_factor=2,
+                                flux_evaluate_indexes=np.array(flux_evaluate_indexes, dtype=bool))
+        x_int, y_int = grid_int.coordinates_evaluate
+        x_bool, y_bool = grid_bool.coordinates_evaluate
+        assert len(x_int) == 3 * 4 * 2 ** 2
+        npt.assert_almost_equal(x_int, x_bool, decimal=10)
+        npt.assert_almost_equal(y_int, y_bool, decimal=10)
+        flux = np.ones_like(x_int)
+        image_low_res, _ = grid_int.flux_array2image_low_high(flux)
+        assert np.sum(image_low_res) == 3 * 4
+
+    def test_subgrid_index(self):
+        transform_pix2angle = np.array([[1, 0], [0, 1]]) * self._deltaPix
+        grid = RegularGrid(self.nx, self.ny, transform_pix2angle, -5, -5, supersampling_factor=3)
+        idex_mask = np.random.rand(self.nx * self.ny) > 0.5
+        idex_sub = grid._subgrid_index(idex_mask, 3, self.nx, self.ny)
+        idex_image = idex_mask.reshape(self.nx, self.ny)
+        idex_sub_repeat = np.repeat(np.repeat(idex_image, 3, axis=0), 3, axis=1).flatten()
+        npt.assert_equal(idex_sub, idex_sub_repeat)
+
+
 if __name__ == '__main__':
     pytest.main()
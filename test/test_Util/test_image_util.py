@@ -241,6 +241,10 @@ def test_re_size():
     grid_same = image_util.re_size(grid, factor=1)
     npt.assert_equal(grid_same, grid)
 
+    grid = np.random.uniform(size=(12, 9))
+    grid_small = image_util.re_size(grid, factor=3)
+    npt.assert_almost_equal(grid_small, grid.reshape(4, 3, 3, 3).mean(3).mean(1), decimal=12)
+
 
 def test_stack_images():
     numPix = 10